@@ -20,9 +20,12 @@ protein_residues = [
     "THR", "TRP", "TYR", "VAL"
 ]
 
-def parse_args():
+def parse_args(argv=None):
     """Parse command line arguments for the script.
     
+    Args:
+        argv (list): Arguments to parse, defaults to sys.argv[1:]
+    
     Returns:
         argparse.Namespace: Parsed command line arguments containing:
             - input_pdb: Path to input PDB file
@@ -43,7 +46,7 @@ def parse_args():
     parser.add_argument('--Lcrop', default=110, type=int, help='Chothia residue number to crop to for light chain a ' + \
                         'reasonable number is between 100 and 110')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if not (args.heavy or args.light):
         raise ValueError('Either heavy or light chain must be specified')
@@ -206,13 +209,16 @@ def convert_to_hlt(
     
     return array(atom_list), cdr_residues
 
-def main():
+def main(argv=None):
     """
     Main function to run the conversion process
+
+    Args:
+        argv (list): Command line arguments, defaults to sys.argv[1:]
     """
 
     # Parse command line arguments
-    args = parse_args()
+    args = parse_args(argv)
     target_chains = args.target.split(',') if args.target else []
 
     # Generate output path if not specified
@@ -14,4 +14,14 @@ def pytest_addoption(parser):
         action="store_true",
         default=False,
         help="Save test outputs to a timestamped directory for later inspection"
-    )
\ No newline at end of file
+    )
+
+
+@pytest.fixture(scope="session")
+def comparison_cache(request):
+    """
+    Provide the pytest cache used to remember passing file comparisons.
+
+    Returns None when the cache provider plugin is disabled (-p no:cacheprovider).
+    """
+    return getattr(request.config, "cache", None)
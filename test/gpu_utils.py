@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+"""
+GPU detection helpers shared by the test modules and the test runner.
+
+The CUDA device query is cached, so fixtures and the runner can ask for
+the GPU type as often as they like without repeated driver round-trips.
+"""
+
+import functools
+
+
+@functools.lru_cache(maxsize=1)
+def get_gpu_properties():
+    """
+    Get the CUDA device properties of GPU 0.
+
+    Returns:
+        torch device properties, or None if no GPU is available
+
+    Raises:
+        ImportError: If torch is not installed
+    """
+    import torch
+
+    if not torch.cuda.is_available():
+        return None
+    return torch.cuda.get_device_properties(0)
+
+
+def get_gpu_name():
+    """
+    Get the name of GPU 0.
+
+    Returns:
+        GPU name (e.g. "NVIDIA H100 80GB HBM3"), or None if no GPU is available
+
+    Raises:
+        ImportError: If torch is not installed
+    """
+    gpu_info = get_gpu_properties()
+    return gpu_info.name if gpu_info is not None else None
+
+
+def get_gpu_count():
+    """
+    Get the number of visible CUDA devices.
+
+    Returns:
+        Number of GPUs, 0 if none are available
+
+    Raises:
+        ImportError: If torch is not installed
+    """
+    import torch
+
+    return torch.cuda.device_count()
@@ -8,11 +8,13 @@ import os
 import shutil
 import tempfile
 from datetime import datetime
+from types import SimpleNamespace
 
 import pytest
-import torch
 
 from rfantibody.config import PathConfig
+from test.gpu_utils import get_gpu_name
+from test.util.util_test_utils import run_command
 
 # Option is defined in the root conftest.py
 
@@ -21,21 +23,32 @@ _test_paths = PathConfig.get_test_paths('proteinmpnn')
 
 
 @pytest.fixture(scope="session", autouse=True)
-def check_gpu():
-    """Check if CUDA is available and we're on a supported GPU"""
-    if not torch.cuda.is_available():
+def gpu_env():
+    """
+    Check that we're on a supported GPU and provide its reference directory.
+
+    Returns:
+        SimpleNamespace with the GPU name and the GPU-specific reference
+        directory (A4000 or H100)
+    """
+    gpu_name = get_gpu_name()
+    if gpu_name is None:
         pytest.skip("No GPU found, tests require a supported GPU (A4000 or H100)")
 
-    gpu_info = torch.cuda.get_device_properties(0)
-    if 'A4000' not in gpu_info.name and 'H100' not in gpu_info.name:
+    if 'A4000' not in gpu_name and 'H100' not in gpu_name:
         pytest.skip("Tests require a supported GPU (A4000 or H100)")
 
     # Log which GPU and reference data we're using
-    print(f"Running tests on {gpu_info.name} GPU")
-    if 'A4000' in gpu_info.name:
+    print(f"Running tests on {gpu_name} GPU")
+    base_ref_dir = _test_paths['references']
+    if 'A4000' in gpu_name:
         print("Using A4000-specific reference outputs")
-    elif 'H100' in gpu_info.name:
+        ref_dir = base_ref_dir / "A4000_references"
+    else:
         print("Using H100-specific reference outputs")
+        ref_dir = base_ref_dir / "H100_references"
+
+    return SimpleNamespace(name=gpu_name, ref_dir=str(ref_dir))
 
 
 @pytest.fixture(scope="session")
@@ -49,17 +62,21 @@ def output_dir(request):
     # Check if we should keep outputs in a timestamped directory
     keep_outputs = request.config.getoption("--keep-outputs", default=False)
 
+    # Give each pytest-xdist worker its own directory so parallel runs don't collide
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+    worker_suffix = f"_{worker}" if worker else ""
+
     if keep_outputs:
         # Create a timestamped directory for inspection
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = _test_paths['outputs'].parent / f"example_outputs_{timestamp}"
+        output_path = _test_paths['outputs'].parent / f"example_outputs_{timestamp}{worker_suffix}"
         os.makedirs(output_path, exist_ok=True)
         print(f"Saving test outputs to: {output_path}")
         return str(output_path)
     else:
         # Create a temporary directory that will be automatically cleaned up
         # We need to keep a reference to temp_dir object so it's not garbage collected
-        temp_dir = tempfile.TemporaryDirectory(prefix="rfantibody_proteinmpnn_test_")
+        temp_dir = tempfile.TemporaryDirectory(prefix=f"rfantibody_proteinmpnn_test{worker_suffix}_")
         # Add the temp_dir object as an attribute of the request.config
         # to ensure it stays in scope until the end of testing
         request.config._rfantibody_proteinmpnn_temp_dir = temp_dir
@@ -67,40 +84,38 @@ def output_dir(request):
 
 
 @pytest.fixture(scope="session")
-def ref_dir():
+def run_script(output_dir):
     """
-    Provide the reference directory path based on GPU type.
+    Run each test script at most once per session.
 
-    Uses GPU-specific references when running on a supported GPU (A4000 or H100).
+    Returns a function taking a script path. The first call runs the script
+    with the output directory as its argument; later calls for the same script
+    reuse that outcome (re-raising its error if it failed), so the parametrized
+    tests and the suite test share a single run of each script.
     """
-    base_ref_dir = _test_paths['references']
+    errors = {}
 
-    # Check which GPU we're running on
-    if torch.cuda.is_available():
-        gpu_info = torch.cuda.get_device_properties(0)
-        if 'A4000' in gpu_info.name:
-            return str(base_ref_dir / "A4000_references")
-        elif 'H100' in gpu_info.name:
-            return str(base_ref_dir / "H100_references")
+    def _run(script_path):
+        if script_path not in errors:
+            try:
+                run_command(["bash", script_path, output_dir])
+                errors[script_path] = None
+            except RuntimeError as e:
+                errors[script_path] = e
+        if errors[script_path] is not None:
+            raise errors[script_path]
 
-    # Default reference dir for other GPUs
-    return str(base_ref_dir)
+    return _run
 
 
 @pytest.fixture(scope="session")
-def clean_output_dir(output_dir):
+def clean_output_dir(request, output_dir):
     """Clean the output directory before tests"""
-    # Clean before tests (only needed if directory already exists)
-    if os.path.exists(output_dir):
-        for f in os.listdir(output_dir):
-            file_path = os.path.join(output_dir, f)
-            try:
-                if os.path.isfile(file_path):
-                    os.unlink(file_path)
-                elif os.path.isdir(file_path):
-                    shutil.rmtree(file_path)
-            except Exception as e:
-                print(f"Error cleaning {file_path}: {e}")
+    # Temporary directories start out empty, so only kept output
+    # directories (--keep-outputs) can hold stale files
+    if request.config.getoption("--keep-outputs", default=False):
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.makedirs(output_dir, exist_ok=True)
 
     # Run tests
     yield
@@ -16,89 +16,118 @@ from test.util.util_test_utils import (
     compare_files,
     compare_pdb_structures,
     create_test_report,
-    run_command,
 )
 
 # Test script configurations
 SCRIPT_CONFIGS = {
     "ab_seq_design.sh": {
         "description": "Design antibody sequences with ProteinMPNN",
-        "output_files": [
+        "output_files": (
             "ab_des_0_dldesign_0.pdb",
             "ab_des_0_dldesign_1.pdb"
-        ]
+        )
     }
 }
 
 # Path to test scripts
 TEST_SCRIPT_DIR = "test/proteinmpnn/scripts"
 
+# Parametrized cases, one per (script, output file) pair so each output passes
+# or fails on its own, built once at collection time. Cases of the same script
+# share an xdist group, so under pytest-xdist (--dist=loadgroup) one worker
+# runs each script once for all of its outputs.
+OUTPUT_CASES = [
+    pytest.param(
+        script_name, output_file,
+        id=f"{script_name}-{output_file}",
+        marks=pytest.mark.xdist_group(script_name),
+    )
+    for script_name, config in SCRIPT_CONFIGS.items()
+    for output_file in config["output_files"]
+]
 
-@pytest.mark.parametrize("script_name", list(SCRIPT_CONFIGS.keys()))
-def test_proteinmpnn_script(script_name, clean_output_dir, output_dir, ref_dir):
+
+@pytest.fixture(scope="session")
+def expected_paths(gpu_env, output_dir):
+    """
+    Map each script to its (reference path, output path) pairs, built once
+    per session for the suite test.
     """
-    Test ProteinMPNN scripts against reference outputs.
+    return {
+        script_name: [(
+            os.path.join(gpu_env.ref_dir, output_file),
+            os.path.join(output_dir, output_file)
+        ) for output_file in config["output_files"]]
+        for script_name, config in SCRIPT_CONFIGS.items()
+    }
+
+
+@pytest.mark.parametrize("script_name,output_file", OUTPUT_CASES)
+def test_proteinmpnn_script(script_name, output_file, clean_output_dir, output_dir, gpu_env, run_script):
+    """
+    Test one output of a ProteinMPNN script against its reference.
     
     Args:
         script_name: Name of the script to test
+        output_file: Name of the output file to verify
         clean_output_dir: Fixture that cleans the output directory
         output_dir: Path to output directory
-        ref_dir: Path to reference directory
+        gpu_env: Detected GPU name and GPU-specific reference directory
+        run_script: Runs a test script once per session and reuses the outcome
     """
+    ref_file = os.path.join(gpu_env.ref_dir, output_file)
+    output_path = os.path.join(output_dir, output_file)
     script_path = f"{TEST_SCRIPT_DIR}/{script_name}"
     description = SCRIPT_CONFIGS[script_name]["description"]
     
+    # Skip before spending GPU time on an output that has no reference
+    if not os.path.exists(ref_file):
+        pytest.skip(f"Reference file not found: {ref_file}")
+    
     # Run the script with the output directory as an argument
     print(f"Running {script_name}: {description}")
-    run_command(f"bash {script_path} {output_dir}")
+    run_script(script_path)
     
-    # Get expected output files from the configuration
-    expected_files = [(
-        os.path.join(ref_dir, output_file),
-        os.path.join(output_dir, output_file)
-    ) for output_file in SCRIPT_CONFIGS[script_name]["output_files"]]
+    assert os.path.exists(output_path), f"Output file not found: {output_path}"
     
-    # Check if all expected files exist
-    for ref_path, output_path in expected_files:
-        assert os.path.exists(output_path), f"Output file not found: {output_path}"
+    # Use biotite-based comparison for PDB files
+    if output_path.endswith('.pdb'):
+        result = compare_pdb_structures(ref_file, output_path)
+    else:
+        result = compare_files(ref_file, output_path)
     
-    # Compare each output file with reference
-    all_differences = {}
-    for ref_file, output_file in expected_files:
-        # Use biotite-based comparison for PDB files
-        if output_file.endswith('.pdb'):
-            result = compare_pdb_structures(ref_file, output_file)
-        else:
-            result = compare_files(ref_file, output_file)
+    # If result is True, files match; if it's a list, there are differences
+    if result is not True:
+        # Format the first few differences for display
+        diff_message = "\n".join(
+            [d.get('message', 'Difference found') for d in result[:5]]
+        )
+        if len(result) > 5:
+            diff_message += f"\n... and {len(result) - 5} more differences"
         
-        # If result is True, files match; if it's a list, there are differences
-        if result is not True:
-            # Store the differences for reporting
-            output_filename = os.path.basename(output_file)
-            all_differences[output_filename] = result
-            
-            # Format the first few differences for display
-            diff_message = "\n".join(
-                [d.get('message', 'Difference found') for d in result[:5]]
-            )
-            if len(result) > 5:
-                diff_message += f"\n... and {len(result) - 5} more differences"
-            
-            pytest.fail(f"Differences found in {output_file}:\n{diff_message}")
+        pytest.fail(f"Differences found in {output_path}:\n{diff_message}")
 
-
-def test_all_scripts_as_suite(clean_output_dir, output_dir, ref_dir):
+def test_all_scripts_as_suite(clean_output_dir, output_dir, gpu_env, run_script, expected_paths):
     """
     Run all scripts in sequence and create a summary report.
     
     This test will run all scripts and create a comprehensive report
-    rather than failing on the first error.
+    rather than failing on the first error. Scripts already run by the
+    parametrized test in this session are not run again.
     
     Args:
         clean_output_dir: Fixture that cleans the output directory
         output_dir: Path to output directory
-        ref_dir: Path to reference directory
+        gpu_env: Detected GPU name and GPU-specific reference directory
+        run_script: Runs a test script once per session and reuses the outcome
+        expected_paths: (reference path, output path) pairs for each script
     """
+    # Under pytest-xdist this test may land on a worker that ran none of the
+    # scripts, and would run them all again next to the other worker's GPU
+    # jobs; the per-output cases already report every result
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        pytest.skip("Suite report is not built under pytest-xdist; see the per-output results")
+    
     results = {}
     
     for script_name in SCRIPT_CONFIGS.keys():
@@ -106,9 +135,10 @@ def test_all_scripts_as_suite(clean_output_dir, output_dir, ref_dir):
         description = SCRIPT_CONFIGS[script_name]["description"]
         print(f"Running {script_name}: {description}")
         
-        # Run the script with the output directory as an argument
+        # Run the script with the output directory as an argument; one at a
+        # time, since each script needs the GPU to itself
         try:
-            run_command(f"bash {script_path} {output_dir}")
+            run_script(script_path)
             success = True
             details = []
         except Exception as e:
@@ -117,17 +147,8 @@ def test_all_scripts_as_suite(clean_output_dir, output_dir, ref_dir):
         
         # Check output files
         if success:
-            expected_files = [(
-                os.path.join(ref_dir, output_file),
-                os.path.join(output_dir, output_file)
-            ) for output_file in SCRIPT_CONFIGS[script_name]["output_files"]]
-            
-            file_differences = {}
-            for ref_file, output_file in expected_files:
+            for ref_file, output_file in expected_paths[script_name]:
                 if not os.path.exists(output_file):
-                    file_differences[os.path.basename(output_file)] = [{
-                        'message': 'File not found'
-                    }]
                     success = False
                     details.append(f"File not found: {output_file}")
                     continue
@@ -144,9 +165,9 @@ def test_all_scripts_as_suite(clean_output_dir, output_dir, ref_dir):
                 
                 if result is not True:
                     output_filename = os.path.basename(output_file)
-                    file_differences[output_filename] = result
                     success = False
-                    details.append(f"Differences in {output_filename}: {len(result)} differences found")
+                    count = f"at least {len(result)}" if result[-1].get('truncated') else len(result)
+                    details.append(f"Differences in {output_filename}: {count} differences found")
                     
                     # Format the first few differences for display
                     diff_message = "\n".join(
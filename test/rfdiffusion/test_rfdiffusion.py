@@ -13,6 +13,7 @@ from pathlib import Path
 import pytest
 
 from test.util.util_test_utils import (
+    cmp_output_files,
     compare_files,
     compare_pdb_structures,
     create_test_report,
@@ -23,38 +24,45 @@ from test.util.util_test_utils import (
 SCRIPT_CONFIGS = {
     "antibody_pdbdesign.sh": {
         "description": "Design an antibody using a PDB framework",
-        "output_files": [
+        "output_files": (
             "ab_des_0.pdb",
             "ab_des_1.pdb"
-        ]
+        )
     },
     "antibody_qvdesign.sh": {
         "description": "Design an antibody using quiver output format",
-        "output_files": [
-            "ab_designs.qv"
-        ]
+        "output_files": (
+            "ab_designs.qv",
+        )
     },
     "nanobody_pdbdesign.sh": {
         "description": "Design a nanobody using a PDB framework",
-        "output_files": [
+        "output_files": (
             "nb_des_0.pdb",
             "nb_des_1.pdb"
-        ]
+        )
     },
     "nanobody_qvdesign.sh": {
         "description": "Design a nanobody using quiver output format",
-        "output_files": [
-            "nb_designs.qv"
-        ]
+        "output_files": (
+            "nb_designs.qv",
+        )
     }
 }
 
 # Path to test scripts
 TEST_SCRIPT_DIR = "test/rfdiffusion/scripts"
 
+# Parametrized cases carrying each script's expected output files, built once
+# at collection time
+SCRIPT_CASES = [
+    pytest.param(script_name, config["output_files"], id=script_name)
+    for script_name, config in SCRIPT_CONFIGS.items()
+]
 
-@pytest.mark.parametrize("script_name", SCRIPT_CONFIGS.keys())
-def test_rfdiffusion_script(script_name, clean_output_dir, output_dir, ref_dir):
+
+@pytest.mark.parametrize("script_name,output_files", SCRIPT_CASES)
+def test_rfdiffusion_script(script_name, output_files, clean_output_dir, output_dir, gpu_env, comparison_cache):
     """
     Run an individual RFDiffusion script and verify its output.
     
@@ -63,14 +71,22 @@ def test_rfdiffusion_script(script_name, clean_output_dir, output_dir, ref_dir):
     
     Args:
         script_name: The name of the script to test
+        output_files: Names of the files the script is expected to produce
         clean_output_dir: Fixture that cleans the output directory
         output_dir: Path to output directory
-        ref_dir: Path to reference directory
+        gpu_env: Detected GPU name and GPU-specific reference directory
+        comparison_cache: pytest cache remembering passing file comparisons
     """
+    ref_dir = gpu_env.ref_dir
     script_path = f"{TEST_SCRIPT_DIR}/{script_name}"
     description = SCRIPT_CONFIGS[script_name]["description"]
     print(f"\n\nTesting: {script_name} - {description}")
     
+    # Skip before spending GPU time on a script that has no references
+    missing_refs = [f for f in output_files if not os.path.exists(os.path.join(ref_dir, f))]
+    if missing_refs:
+        pytest.skip(f"Reference files not found in {ref_dir}: {', '.join(missing_refs)}")
+    
     # Create a report file for this specific test
     report_file = f"test/rfdiffusion/reports/{os.path.splitext(script_name)[0]}_report.txt"
     os.makedirs(os.path.dirname(report_file), exist_ok=True)
@@ -80,7 +96,7 @@ def test_rfdiffusion_script(script_name, clean_output_dir, output_dir, ref_dir):
     # Run the script with the output directory as an argument
     try:
         print(f"Running command: bash {script_path} {output_dir}")
-        run_command(f"bash {script_path} {output_dir}")
+        run_command(["bash", script_path, output_dir])
         success = True
         details = []
     except Exception as e:
@@ -89,36 +105,33 @@ def test_rfdiffusion_script(script_name, clean_output_dir, output_dir, ref_dir):
     
     # Check output files
     if success:
-        expected_files = [(
-            os.path.join(ref_dir, output_file),
-            os.path.join(output_dir, output_file)
-        ) for output_file in SCRIPT_CONFIGS[script_name]["output_files"]]
+        # Byte-identical outputs pass without a detailed comparison
+        match, mismatch, errors = cmp_output_files(
+            ref_dir, output_dir, output_files
+        )
         
-        file_differences = {}
-        for ref_file, output_file in expected_files:
+        for output_filename in errors:
+            output_file = os.path.join(output_dir, output_filename)
             if not os.path.exists(output_file):
-                file_differences[os.path.basename(output_file)] = [{
-                    'message': 'File not found'
-                }]
                 success = False
                 details.append(f"File not found: {output_file}")
-                continue
-            
-            if not os.path.exists(ref_file):
-                details.append(f"Reference file not found: {ref_file}")
-                continue
+            else:
+                details.append(f"Reference file not found: {os.path.join(ref_dir, output_filename)}")
+        
+        for output_filename in mismatch:
+            ref_file = os.path.join(ref_dir, output_filename)
+            output_file = os.path.join(output_dir, output_filename)
             
             # Use biotite-based comparison for PDB files, generic comparison for others
             if output_file.endswith('.pdb'):
                 result = compare_pdb_structures(ref_file, output_file)
             else:
-                result = compare_files(ref_file, output_file)
+                result = compare_files(ref_file, output_file, cache=comparison_cache)
             
             if result is not True:
-                output_filename = os.path.basename(output_file)
-                file_differences[output_filename] = result
                 success = False
-                details.append(f"Differences in {output_filename}: {len(result)} differences found")
+                count = f"at least {len(result)}" if result[-1].get('truncated') else len(result)
+                details.append(f"Differences in {output_filename}: {count} differences found")
                 
                 # Format the first few differences for display
                 diff_message = "\n".join(
@@ -133,19 +146,17 @@ def test_rfdiffusion_script(script_name, clean_output_dir, output_dir, ref_dir):
         'details': details
     }
     
-    # Create a detailed report for this specific test
-    create_test_report(results, report_file)
-    
     # Log detailed information about GPU and test environment in the report
-    with open(report_file, 'a') as f:
-        f.write("\nTest Environment:\n")
-        f.write("----------------\n")
-        import torch
-        if torch.cuda.is_available():
-            gpu_info = torch.cuda.get_device_properties(0)
-            f.write(f"GPU: {gpu_info.name}\n")
-            f.write(f"Reference directory: {ref_dir}\n")
-            f.write(f"Output directory: {output_dir}\n")
+    env_lines = [
+        "\nTest Environment:",
+        "----------------",
+        f"GPU: {gpu_env.name}",
+        f"Reference directory: {ref_dir}",
+        f"Output directory: {output_dir}",
+    ]
+    
+    # Create a detailed report for this specific test
+    create_test_report(results, report_file, extra="\n".join(env_lines) + "\n")
     
     # The test should pass if the script passed
     if not success:
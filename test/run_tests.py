@@ -8,13 +8,114 @@ and generate reference files when needed.
 """
 
 import argparse
+import importlib.util
 import os
+import signal
 import subprocess
 import sys
+import time
 from pathlib import Path
 
-import pytest
-from test.rfdiffusion.rfab_test_utils import copy_reference_files
+from test.gpu_utils import get_gpu_count, get_gpu_name, get_gpu_properties
+
+# Root directory of the test suite
+TESTS_DIR = Path(__file__).parent
+
+# Modules whose scripts run on the GPU
+GPU_MODULES = ['rfdiffusion', 'proteinmpnn', 'rf2']
+
+# GPU modules with at least two scripts, which pytest-xdist can spread over
+# two workers; a module with a single script would leave one worker idle
+XDIST_MODULES = ['rfdiffusion', 'rf2']
+
+# GPUs with more memory than this (e.g. H100) fit two concurrent diffusion runs
+PARALLEL_GPU_MEMORY = 40e9
+
+
+def can_run_tests_in_parallel():
+    """
+    Check whether GPU tests can run two at a time with pytest-xdist.
+    
+    Returns:
+        True if pytest-xdist is installed and the GPU has enough memory
+    """
+    if importlib.util.find_spec("xdist") is None:
+        return False
+    try:
+        gpu_info = get_gpu_properties()
+    except ImportError:
+        return False
+    return gpu_info is not None and gpu_info.total_memory > PARALLEL_GPU_MEMORY
+
+
+def run_scripts(scripts, output_dir, max_parallel=1, pin_gpus=False):
+    """
+    Run test scripts concurrently, failing fast on the first error.
+    
+    Each script's combined stdout/stderr is written to <script>.log in
+    output_dir. When a script exits with a non-zero status, the scripts
+    still running are killed along with every process they started.
+    
+    Args:
+        scripts: Paths of the bash scripts to run
+        output_dir: Output directory passed to each script
+        max_parallel: Maximum number of scripts running at the same time
+        pin_gpus: Give each concurrent script its own GPU via CUDA_VISIBLE_DEVICES,
+                  picked from the devices already visible to this process
+        
+    Raises:
+        subprocess.CalledProcessError: If any script exits with a non-zero status
+    """
+    pending = list(scripts)
+    free_slots = list(range(max_parallel))
+    
+    # Slots index into the devices the user already made visible, so
+    # CUDA_VISIBLE_DEVICES=2,3 runs slot 0 on GPU 2 rather than GPU 0
+    visible_devices = os.environ.get('CUDA_VISIBLE_DEVICES')
+    if visible_devices:
+        devices = [device.strip() for device in visible_devices.split(',')]
+    else:
+        devices = [str(slot) for slot in range(max_parallel)]
+    
+    running = []
+    try:
+        while pending or running:
+            while pending and free_slots:
+                script = pending.pop(0)
+                slot = free_slots.pop(0)
+                env = dict(os.environ)
+                if pin_gpus:
+                    env['CUDA_VISIBLE_DEVICES'] = devices[slot]
+                log_path = Path(output_dir) / f"{script.stem}.log"
+                print(f"Running {script.parent.parent.name}/{script.name} (log: {log_path})...")
+                log_file = open(log_path, 'wb')
+                proc = subprocess.Popen(
+                    ['bash', str(script), str(output_dir)],
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    env=env,
+                    # Own process group, so a kill also reaches the GPU jobs
+                    # the script starts
+                    start_new_session=True,
+                )
+                running.append((proc, slot, log_file, log_path))
+            
+            time.sleep(0.1)
+            for entry in list(running):
+                proc, slot, log_file, log_path = entry
+                if proc.poll() is None:
+                    continue
+                running.remove(entry)
+                free_slots.append(slot)
+                log_file.close()
+                if proc.returncode != 0:
+                    print(f"Error: {proc.args[1]} failed, see {log_path}")
+                    raise subprocess.CalledProcessError(proc.returncode, proc.args)
+    finally:
+        for proc, _, log_file, _ in running:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+            log_file.close()
 
 
 def main():
@@ -46,16 +147,20 @@ def main():
     
     # If creating reference files, run scripts and copy outputs for each module
     if args.create_refs:
+        # Imported here since the comparison utilities pull in pytest, numpy and biotite
+        from test.rfdiffusion.rfab_test_utils import copy_reference_files
+        
         print("Running scripts to create reference files...")
         
         # First check if we're on the right GPU for GPU-dependent modules
-        gpu_modules = ['rfdiffusion', 'proteinmpnn', 'rf2']
+        gpu_modules = GPU_MODULES
         gpu_dependent_modules = [m for m in modules if m in gpu_modules]
+        num_gpus = 1
         
         if gpu_dependent_modules:
             try:
-                import torch
-                if not torch.cuda.is_available():
+                gpu_name = get_gpu_name()
+                if gpu_name is None:
                     print("Error: No GPU found. Reference files for GPU modules must be created on a supported GPU (A4000 or H100).")
                     if all(m in gpu_modules for m in modules):
                         return 1
@@ -64,48 +169,49 @@ def main():
                         modules = [m for m in modules if m not in gpu_modules]
                 
                 else:
-                    gpu_info = torch.cuda.get_device_properties(0)
-                    if 'A4000' not in gpu_info.name and 'H100' not in gpu_info.name:
-                        print(f"Error: Unsupported GPU type. Found {gpu_info.name}, tests require A4000 or H100.")
+                    if 'A4000' not in gpu_name and 'H100' not in gpu_name:
+                        print(f"Error: Unsupported GPU type. Found {gpu_name}, tests require A4000 or H100.")
                         if all(m in gpu_modules for m in modules):
                             return 1
                         else:
                             print("Continuing with non-GPU modules only.")
                             modules = [m for m in modules if m not in gpu_modules]
                     else:
-                        print(f"Creating reference files for {gpu_info.name} GPU")
+                        num_gpus = max(get_gpu_count(), 1)
+                        print(f"Creating reference files for {gpu_name} GPU")
             except ImportError:
                 print("Warning: torch not found, cannot check GPU type")
         
         # Process each selected module
         for module in modules:
-            tests_dir = Path(__file__).parent
-            module_dir = tests_dir / module
+            module_dir = TESTS_DIR / module
             output_dir = module_dir / "example_outputs"
             
             # Determine the correct reference directory based on GPU type
             ref_base_dir = module_dir / "reference_outputs"
             try:
-                import torch
-                gpu_info = torch.cuda.get_device_properties(0)
-                if 'A4000' in gpu_info.name:
-                    ref_dir = ref_base_dir / "A4000_references"
-                elif 'H100' in gpu_info.name:
-                    ref_dir = ref_base_dir / "H100_references"
-                else:
-                    ref_dir = ref_base_dir
+                gpu_name = get_gpu_name() or ""
             except ImportError:
+                gpu_name = ""
+            if 'A4000' in gpu_name:
+                ref_dir = ref_base_dir / "A4000_references"
+            elif 'H100' in gpu_name:
+                ref_dir = ref_base_dir / "H100_references"
+            else:
                 ref_dir = ref_base_dir
             
             # Make sure output directory exists
             os.makedirs(output_dir, exist_ok=True)
             os.makedirs(ref_dir, exist_ok=True)
             
-            # Run each of our test scripts with the output directory as an argument
+            # Run our test scripts with the output directory as an argument,
+            # one per GPU for GPU modules and one per core otherwise
             script_dir = module_dir / "scripts"
-            for script in script_dir.glob("*.sh"):
-                print(f"Running {module}/{script.name}...")
-                subprocess.run(['bash', str(script), str(output_dir)], check=True)
+            scripts = sorted(script_dir.glob("*.sh"))
+            if module in gpu_modules:
+                run_scripts(scripts, output_dir, max_parallel=num_gpus, pin_gpus=num_gpus > 1)
+            else:
+                run_scripts(scripts, output_dir, max_parallel=os.cpu_count() or 1)
             
             # Copy output files to reference directory
             print(f"Copying {module} output files to reference directory...")
@@ -115,6 +221,8 @@ def main():
         return 0
     
     # Run tests for each selected module
+    import pytest
+    
     all_results = []
     for module in modules:
         print(f"\nRunning {module} tests...")
@@ -125,6 +233,12 @@ def main():
         if args.verbose:
             pytest_args.append("-v")
         
+        # Run two scripts at once on GPUs with room for both, keeping the
+        # per-output cases of each script on the same worker
+        if module in XDIST_MODULES and can_run_tests_in_parallel():
+            print("Running tests with 2 pytest-xdist workers")
+            pytest_args.extend(["-n=2", "--dist=loadgroup"])
+        
         # Pass through the keep-outputs flag to pytest
         if args.keep_outputs:
             print(f"Using test/{module}/example_outputs directory (outputs will be kept)")
@@ -12,6 +12,8 @@ import pytest
 
 from rfantibody.config import PathConfig
 
+from .util_test_utils import _parse_reference_structure, _verify_hlt_format
+
 # Get test paths for this module
 _test_paths = PathConfig.get_test_paths('util')
 
@@ -49,21 +51,23 @@ def ref_dir():
 
 
 @pytest.fixture(scope="session")
-def clean_output_dir(output_dir):
+def clean_output_dir(request, output_dir):
     """Clean the output directory before and after tests"""
-    # Clean before tests
-    if os.path.exists(output_dir):
-        for f in os.listdir(output_dir):
-            file_path = os.path.join(output_dir, f)
-            if os.path.isfile(file_path):
-                if f != "input" and not os.path.isdir(file_path):
-                    try:
-                        os.unlink(file_path)
-                    except Exception as e:
-                        print(f"Error cleaning {file_path}: {e}")
+    # Temporary directories start out empty, so only the kept output
+    # directory (--keep-outputs) can hold stale files
+    if request.config.getoption("--keep-outputs", default=False):
+        shutil.rmtree(output_dir, ignore_errors=True)
     
     # Ensure input directory exists
     os.makedirs(os.path.join(output_dir, "input"), exist_ok=True)
     
     # Run tests
-    yield
\ No newline at end of file
+    yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def clear_file_caches():
+    """Drop cached HLT format checks and reference structures at the end of the session"""
+    yield
+    _verify_hlt_format.cache_clear()
+    _parse_reference_structure.cache_clear()
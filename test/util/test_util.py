@@ -7,12 +7,15 @@ This test suite tests the antibody format conversion utility (chothia2HLT.py)
 and ensures it correctly processes antibody and nanobody structures.
 """
 
+import functools
+import importlib.util
 import os
-import torch
 from pathlib import Path
 
 import pytest
 
+from test.gpu_utils import get_gpu_name
+
 from .util_test_utils import (
     compare_files,
     compare_pdb_structures,
@@ -21,11 +24,23 @@ from .util_test_utils import (
     verify_hlt_format,
 )
 
+# A script with an "entrypoint" runs in-process with "args", which mirror the
+# python call in its .sh wrapper (the output path is appended at run time).
+# Scripts without one run their .sh wrapper, which keeps the wrapper path
+# covered; keep at least one such script.
 SCRIPT_CONFIGS = {
     "antibody_hlt_conversion.sh": {
         "description": "Convert antibody PDB files from Chothia to HLT format",
         "output": "antibody_HLT.pdb",
-        "ref": "hu-4D5-8_Fv.pdb"
+        "ref": "hu-4D5-8_Fv.pdb",
+        "entrypoint": "scripts/util/chothia2HLT.py",
+        "args": [
+            "test/util/inputs_for_test/6mh2_chothia.pdb",
+            "--heavy", "D",
+            "--light", "C",
+            "--Hcrop", "113",
+            "--Lcrop", "107",
+        ]
     },
     "nanobody_hlt_conversion.sh": {
         "description": "Convert nanobody PDB files from Chothia to HLT format",
@@ -39,6 +54,48 @@ SCRIPT_CONFIGS = {
 TEST_SCRIPT_DIR = "test/util/scripts"
 
 
+@functools.lru_cache(maxsize=None)
+def load_entrypoint(script_path):
+    """
+    Import a Python script by path, once per session.
+    
+    Args:
+        script_path: Path to the Python script
+        
+    Returns:
+        The script's main function
+    """
+    spec = importlib.util.spec_from_file_location(Path(script_path).stem, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.main
+
+
+def run_script(script_name, output_dir):
+    """
+    Run a test script, in-process when it has a Python entry point.
+    
+    Args:
+        script_name: Name of the script in SCRIPT_CONFIGS
+        output_dir: Path to output directory
+        
+    Raises:
+        RuntimeError: If the script fails
+    """
+    config = SCRIPT_CONFIGS[script_name]
+    if "entrypoint" not in config:
+        run_command(["bash", f"{TEST_SCRIPT_DIR}/{script_name}", output_dir])
+        return
+    
+    argv = config["args"] + ["--output", os.path.join(output_dir, config["output"])]
+    print(f"Running {config['entrypoint']} in-process: {' '.join(argv)}")
+    try:
+        load_entrypoint(config["entrypoint"])(argv)
+    except SystemExit as e:
+        # argparse exits on invalid arguments
+        raise RuntimeError(f"{config['entrypoint']} exited with status {e.code}") from e
+
+
 @pytest.mark.parametrize("script_name", SCRIPT_CONFIGS.keys())
 def test_util_script(script_name, clean_output_dir, output_dir, ref_dir):
     """
@@ -53,7 +110,6 @@ def test_util_script(script_name, clean_output_dir, output_dir, ref_dir):
         output_dir: Path to output directory
         ref_dir: Path to reference directory
     """
-    script_path = f"{TEST_SCRIPT_DIR}/{script_name}"
     description = SCRIPT_CONFIGS[script_name]["description"]
     print(f"\n\nTesting: {script_name} - {description}")
     
@@ -65,8 +121,7 @@ def test_util_script(script_name, clean_output_dir, output_dir, ref_dir):
     
     # Run the script with the output directory as an argument
     try:
-        print(f"Running command: bash {script_path} {output_dir}")
-        run_command(f"bash {script_path} {output_dir}")
+        run_script(script_name, output_dir)
         success = True
         details = []
     except Exception as e:
@@ -87,51 +142,37 @@ def test_util_script(script_name, clean_output_dir, output_dir, ref_dir):
                 success = False
                 details.append(f"HLT format validation failed for {output_file}: {validation['issues']}")
     
-    # Check output files
+    # Check output files (the output's existence was checked above, as
+    # success would otherwise be False)
     if success:
-        file_differences = {}
-        
-        output_file_name = SCRIPT_CONFIGS[script_name]["output"]
-        output_file = os.path.join(output_dir, output_file_name)
+        # Get the corresponding reference file
+        ref_file_name = SCRIPT_CONFIGS[script_name]["ref"]
+        ref_file = os.path.join(ref_dir, ref_file_name)
         
-        if not os.path.exists(output_file):
-            file_differences[output_file_name] = [{
-                'message': 'File not found'
-            }]
-            success = False
-            details.append(f"File not found: {output_file}")
+        if not os.path.exists(ref_file):
+            details.append(f"Reference file not found: {ref_file}")
         else:
-            # Get the corresponding reference file
-            ref_file_name = SCRIPT_CONFIGS[script_name]["ref"]
-            ref_file = os.path.join(ref_dir, ref_file_name)
-            
-            if not os.path.exists(ref_file):
-                details.append(f"Reference file not found: {ref_file}")
-            else:
-                # Compare PDB structures using biotite
-                struct_result = compare_pdb_structures(ref_file, output_file)
-                if struct_result is not True:
-                    file_differences[output_file_name] = struct_result
-                    success = False
-                    details.append(f"Structure differences in {output_file_name}: {len(struct_result)} differences found")
+            # Compare PDB structures using biotite
+            struct_result = compare_pdb_structures(ref_file, output_file)
+            if struct_result is not True:
+                success = False
+                details.append(f"Structure differences in {output_file_name}: {len(struct_result)} differences found")
     
     results[script_name] = {
         'passed': success,
         'details': details
     }
     
-    # Create a detailed report for this specific test
-    create_test_report(results, report_file)
-    
     # Log detailed information about GPU and test environment in the report
-    with open(report_file, 'a') as f:
-        f.write("\nTest Environment:\n")
-        f.write("----------------\n")
-        if torch.cuda.is_available():
-            gpu_info = torch.cuda.get_device_properties(0)
-            f.write(f"GPU: {gpu_info.name}\n")
-        f.write(f"Reference directory: {ref_dir}\n")
-        f.write(f"Output directory: {output_dir}\n")
+    env_lines = ["\nTest Environment:", "----------------"]
+    gpu_name = get_gpu_name()
+    if gpu_name is not None:
+        env_lines.append(f"GPU: {gpu_name}")
+    env_lines.append(f"Reference directory: {ref_dir}")
+    env_lines.append(f"Output directory: {output_dir}")
+    
+    # Create a detailed report for this specific test
+    create_test_report(results, report_file, extra="\n".join(env_lines) + "\n")
     
     # The test should pass if the script passed
     if not success:
@@ -4,10 +4,17 @@
 Utility functions for utility script tests.
 """
 
-import filecmp
+import contextlib
+import functools
+import hashlib
+import itertools
 import os
+import re
 import shutil
 import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Union
 
@@ -15,6 +22,209 @@ import numpy as np
 import pytest
 from biotite.structure.io.pdb import PDBFile
 
+# Read size used when hashing files for equality checks
+_DIGEST_CHUNK_SIZE = 1 << 16
+
+# Suffix of the sidecar files storing precomputed reference digests
+_DIGEST_SIDECAR_SUFFIX = '.blake2b'
+
+# Size in bytes of the BLAKE2b digests used for file equality checks
+_DIGEST_SIZE = 16
+
+# Precompiled matchers for the PDB record types these utilities inspect.
+# They run over the raw file bytes, so non-matching lines never reach Python.
+_REMARK_RE = re.compile(rb'^REMARK[^\n]*', re.MULTILINE)
+_SCORE_RE = re.compile(rb'^SCORE [^\n]*', re.MULTILINE)
+_ATOM_RECORD_RE = re.compile(rb'^(?:ATOM|HETATM|MODEL|ENDMDL)[^\n]*', re.MULTILINE)
+
+# Version of the compare_files line comparison, part of its pytest cache key.
+# Bump it whenever the comparison changes, so passing results cached by an
+# earlier, possibly laxer comparison are not reused.
+_COMPARISON_VERSION = 1
+
+# Prefix of the CDR annotation lines checked by compare_files and verify_hlt_format
+_CDR_LABEL_PREFIX = b'REMARK PDBinfo-LABEL:'
+
+# Record names of the coordinate lines whose chain IDs verify_hlt_format checks
+_ATOM_PREFIX = b'ATOM'
+_HETATM_PREFIX = b'HETATM'
+
+# Chain IDs allowed in HLT files, and the chain every HLT file must have
+_VALID_HLT_CHAINS = frozenset((b'H', b'L', b'T', b' '))
+_REQUIRED_HLT_CHAIN = b'H'
+
+
+@functools.lru_cache(maxsize=256)
+def _file_digest(path: str, mtime_ns: int, size: int) -> bytes:
+    """
+    Compute a BLAKE2b digest of a file's contents.
+
+    Results are cached on (path, mtime_ns, size), so reference files compared
+    repeatedly across parametrized tests are only read once per session.
+
+    Args:
+        path: Path to the file
+        mtime_ns: Modification time of the file in nanoseconds (cache key only)
+        size: Size of the file in bytes (cache key only)
+
+    Returns:
+        16-byte digest of the file contents
+    """
+    with open(path, 'rb') as f:
+        # The project pins Python 3.10, so the chunked loop below is what
+        # runs today; file_digest (hashing in C with the GIL released) only
+        # takes over once requires-python moves to 3.11 or later
+        if sys.version_info >= (3, 11):
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=_DIGEST_SIZE)).digest()
+        digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+        for chunk in iter(lambda: f.read(_DIGEST_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def write_digest_sidecar(ref_file: Union[str, Path], ref_stat: os.stat_result = None) -> bytes:
+    """
+    Compute a reference file's digest and store it in its .blake2b sidecar.
+
+    Args:
+        ref_file: Path to reference file
+        ref_stat: os.stat result for ref_file, if the caller already has one
+
+    Returns:
+        16-byte digest of the file contents
+    """
+    if ref_stat is None:
+        ref_stat = os.stat(ref_file)
+    digest = _file_digest(str(ref_file), ref_stat.st_mtime_ns, ref_stat.st_size)
+    sidecar = f"{ref_file}{_DIGEST_SIDECAR_SUFFIX}"
+    try:
+        # Write to a temporary file and move it into place, so a concurrent
+        # reader never sees a partially written sidecar
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(sidecar) or '.', prefix=f"{os.path.basename(sidecar)}.", suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(digest.hex() + '\n')
+            os.replace(tmp_path, sidecar)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+    except OSError:
+        # Read-only reference directories simply go without a sidecar
+        pass
+    return digest
+
+
+def _reference_digest(ref_file: Union[str, Path], ref_stat: os.stat_result = None) -> bytes:
+    """
+    Get the digest of a reference file, preferring its on-disk sidecar.
+
+    The sidecar is trusted only if it is at least as new as the reference
+    and holds a full-length digest; otherwise the digest is recomputed and
+    the sidecar rewritten.
+
+    Args:
+        ref_file: Path to reference file
+        ref_stat: os.stat result for ref_file, if the caller already has one
+
+    Returns:
+        16-byte digest of the file contents
+    """
+    if ref_stat is None:
+        ref_stat = os.stat(ref_file)
+    try:
+        sidecar_stat = os.stat(f"{ref_file}{_DIGEST_SIDECAR_SUFFIX}")
+        if sidecar_stat.st_mtime_ns >= ref_stat.st_mtime_ns:
+            with open(f"{ref_file}{_DIGEST_SIDECAR_SUFFIX}", 'r') as f:
+                digest = bytes.fromhex(f.read().strip())
+            # An empty or cut-off sidecar still decodes, so check its length
+            if len(digest) == _DIGEST_SIZE:
+                return digest
+    except (OSError, ValueError):
+        pass
+    return write_digest_sidecar(ref_file, ref_stat)
+
+
+def _files_identical(
+    ref_file: Union[str, Path],
+    output_file: Union[str, Path],
+    ref_stat: os.stat_result = None,
+    out_stat: os.stat_result = None,
+) -> bool:
+    """
+    Check whether an output file is byte-identical to its reference.
+
+    Args:
+        ref_file: Path to reference file
+        output_file: Path to output file
+        ref_stat: os.stat result for ref_file, if the caller already has one
+        out_stat: os.stat result for output_file, if the caller already has one
+
+    Returns:
+        True if both files have the same contents
+    """
+    if ref_stat is None:
+        ref_stat = os.stat(ref_file)
+    if out_stat is None:
+        out_stat = os.stat(output_file)
+    if ref_stat.st_size != out_stat.st_size:
+        return False
+    out_digest = _file_digest(str(output_file), out_stat.st_mtime_ns, out_stat.st_size)
+    return _reference_digest(ref_file, ref_stat) == out_digest
+
+
+def cmp_output_files(ref_dir, output_dir, filenames):
+    """
+    Sort output files into identical, differing and missing, like filecmp.cmpfiles.
+
+    Uses the cached content digests (and reference sidecars), so only files
+    that actually differ need a detailed comparison afterwards.
+
+    Args:
+        ref_dir: Path to reference directory
+        output_dir: Path to output directory
+        filenames: Names of files present in both directories
+
+    Returns:
+        Tuple of (match, mismatch, errors) lists of file names, where errors
+        holds files missing from either directory
+    """
+    match, mismatch, errors = [], [], []
+    for filename in filenames:
+        ref_file = os.path.join(ref_dir, filename)
+        output_file = os.path.join(output_dir, filename)
+        try:
+            identical = _files_identical(ref_file, output_file)
+        except FileNotFoundError:
+            errors.append(filename)
+            continue
+        (match if identical else mismatch).append(filename)
+    return match, mismatch, errors
+
+
+def _atom_record_digest(pdb_path: Union[str, Path]) -> bytes:
+    """
+    Compute a digest over the ATOM/HETATM (and MODEL/ENDMDL) records of a PDB file.
+
+    Two files with the same digest parse to the same structure, so a matching
+    digest lets structure comparisons skip parsing entirely.
+
+    Args:
+        pdb_path: Path to PDB file
+
+    Returns:
+        16-byte digest of the atom records (trailing whitespace ignored)
+    """
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    with open(pdb_path, 'rb') as f:
+        data = f.read()
+    for m in _ATOM_RECORD_RE.finditer(data):
+        digest.update(m.group().rstrip())
+        digest.update(b'\n')
+    return digest.digest()
+
 
 def _extract_remark_lines(pdb_path: Union[str, Path]) -> list:
     """
@@ -26,12 +236,9 @@ def _extract_remark_lines(pdb_path: Union[str, Path]) -> list:
     Returns:
         List of REMARK lines (stripped of whitespace)
     """
-    remark_lines = []
-    with open(pdb_path, 'r') as f:
-        for line in f:
-            if line.startswith('REMARK'):
-                remark_lines.append(line.strip())
-    return remark_lines
+    with open(pdb_path, 'rb') as f:
+        data = f.read()
+    return [m.group().decode().strip() for m in _REMARK_RE.finditer(data)]
 
 
 def _extract_score_lines(pdb_path: Union[str, Path]) -> dict:
@@ -45,18 +252,19 @@ def _extract_score_lines(pdb_path: Union[str, Path]) -> dict:
         Dictionary mapping score names to float values
     """
     scores = {}
-    with open(pdb_path, 'r') as f:
-        for line in f:
-            if line.startswith('SCORE '):
-                # Format: "SCORE metric_name: value"
-                parts = line.strip().split(':', 1)
-                if len(parts) == 2:
-                    metric_name = parts[0].replace('SCORE ', '').strip()
-                    try:
-                        value = float(parts[1].strip())
-                        scores[metric_name] = value
-                    except ValueError:
-                        pass
+    with open(pdb_path, 'rb') as f:
+        data = f.read()
+    for m in _SCORE_RE.finditer(data):
+        line = m.group().decode()
+        # Format: "SCORE metric_name: value"
+        parts = line.strip().split(':', 1)
+        if len(parts) == 2:
+            metric_name = parts[0].replace('SCORE ', '').strip()
+            try:
+                value = float(parts[1].strip())
+                scores[metric_name] = value
+            except ValueError:
+                pass
     return scores
 
 
@@ -140,30 +348,42 @@ def compare_score_lines(
     return True if not differences else differences
 
 
-def run_command(cmd, cwd=None):
+def run_command(cmd, cwd=None, capture=False):
     """
-    Run a shell command and return its output.
+    Run a command, optionally returning its output.
+    
+    stderr goes to a temporary file rather than a pipe and is only read back
+    if the command fails. stdout is discarded unless capture is set, so
+    chatty scripts cost neither memory nor decoding.
     
     Args:
-        cmd: Command to run
+        cmd: Command to run as an argv list (executed directly, without a shell)
         cwd: Working directory for the command
+        capture: Whether to collect and return the command's stdout
         
     Returns:
-        Command output as string
+        Command output as string if capture is set, otherwise None
         
     Raises:
         RuntimeError: If command fails
     """
-    result = subprocess.run(
-        cmd, 
-        shell=True, 
-        capture_output=True, 
-        text=True,
-        cwd=cwd
-    )
-    if result.returncode != 0:
-        raise RuntimeError(f"Command failed with error: {result.stderr}")
-    return result.stdout
+    stdout_target = tempfile.TemporaryFile() if capture else contextlib.nullcontext(subprocess.DEVNULL)
+    with tempfile.TemporaryFile() as stderr, stdout_target as stdout:
+        result = subprocess.run(
+            cmd, 
+            shell=False, 
+            stdout=stdout, 
+            stderr=stderr,
+            cwd=cwd
+        )
+        if result.returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(f"Command failed with error: {stderr.read().decode(errors='replace')}")
+        if not capture:
+            return None
+        stdout.seek(0)
+        return stdout.read().decode(errors='replace')
+
 
 def compare_pdb_structures(
     ref_file: Union[str, Path],
@@ -172,6 +392,7 @@ def compare_pdb_structures(
     check_elements: bool = True,
     check_residues: bool = True,
     check_remarks: bool = True,
+    ref_structure=None,
 ) -> Union[bool, list]:
     """
     Compare two PDB files using biotite to verify structural consistency.
@@ -191,6 +412,9 @@ def compare_pdb_structures(
         check_elements: Whether to verify element types match
         check_residues: Whether to verify residue names match
         check_remarks: Whether to verify REMARK lines are identical
+        ref_structure: Optional pre-parsed reference structure (model 1).
+                       When omitted, ref_file is parsed on first use and the
+                       structure is reused by later comparisons against it.
         
     Returns:
         True if structures match within tolerances, or a list of differences
@@ -204,12 +428,22 @@ def compare_pdb_structures(
     if not ref_path.exists():
         pytest.fail(f"Reference file not found: {ref_file}")
     
+    # Fast path: identical files trivially match, and identical atom records
+    # parse to identical structures, so only the REMARK lines are left to check
+    if _files_identical(ref_path, out_path):
+        return True
+    if _atom_record_digest(ref_path) == _atom_record_digest(out_path) and (
+        not check_remarks
+        or _extract_remark_lines(ref_path) == _extract_remark_lines(out_path)
+    ):
+        return True
+    
     differences = []
     
     # Parse PDB files using biotite
     try:
-        ref_pdb = PDBFile.read(str(ref_path))
-        ref_structure = ref_pdb.get_structure(model=1)
+        if ref_structure is None:
+            ref_structure = parse_reference_structure(ref_path)
     except Exception as e:
         differences.append({
             'type': 'parse_error',
@@ -314,80 +548,270 @@ def compare_pdb_structures(
     return True if not differences else differences
 
 
-def compare_files(ref_file, output_file, ignore_lines=None):
+def parse_reference_structure(ref_file: Union[str, Path]):
+    """
+    Parse a reference PDB file with biotite, once per session.
+    
+    Parsing is deferred until a comparison actually needs the structure, so
+    references whose outputs pass the atom record fast path in
+    compare_pdb_structures are never parsed.
+    
+    Args:
+        ref_file: Path to reference PDB file
+        
+    Returns:
+        The model 1 structure of the reference file
+    """
+    ref_stat = os.stat(ref_file)
+    return _parse_reference_structure(str(ref_file), ref_stat.st_mtime_ns, ref_stat.st_size)
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_reference_structure(path: str, mtime_ns: int, size: int):
+    """
+    Parse a PDB file with biotite, caching the structure by file identity.
+    
+    Args:
+        path: Path to the PDB file
+        mtime_ns: Modification time of the file in nanoseconds (cache key only)
+        size: Size of the file in bytes (cache key only)
+        
+    Returns:
+        The model 1 structure of the file
+    """
+    return PDBFile.read(path).get_structure(model=1)
+
+
+def _iter_cdr_label_lines(f, ignore_prefixes=()):
+    """
+    Lazily yield the stripped CDR label lines of an open binary file.
+
+    Args:
+        f: File object opened in binary mode
+        ignore_prefixes: Tuple of bytes prefixes of lines to skip
+
+    Yields:
+        Stripped REMARK PDBinfo-LABEL lines as bytes
+    """
+    for line in f:
+        if line.startswith(_CDR_LABEL_PREFIX):
+            line = line.strip()
+            if not (ignore_prefixes and line.startswith(ignore_prefixes)):
+                yield line
+
+
+def _comparison_cache_key(ref_file, output_file, ignore_lines, ref_stat, out_stat):
+    """
+    Build the pytest cache key and content stamp for a compare_files call.
+    
+    The key uses the output's file name rather than its path, since outputs
+    are written to a fresh temporary or timestamped directory every session,
+    and the stamp uses both files' content digests rather than their
+    modification times, so a rerun producing the same output hits the cache.
+    _COMPARISON_VERSION is part of the key, so changing the comparison
+    invalidates earlier results.
+    
+    Args:
+        ref_file: Path to reference file
+        output_file: Path to output file
+        ignore_lines: Line prefixes ignored by the comparison
+        ref_stat: os.stat result for ref_file
+        out_stat: os.stat result for output_file
+        
+    Returns:
+        Tuple of (cache key, [ref digest, out digest] as hex strings)
+    """
+    identity = (
+        f"{_COMPARISON_VERSION}|{os.path.abspath(ref_file)}|{os.path.basename(output_file)}|{ignore_lines}"
+    )
+    key = "rfantibody/compare_files/" + hashlib.blake2b(identity.encode(), digest_size=8).hexdigest()
+    out_digest = _file_digest(str(output_file), out_stat.st_mtime_ns, out_stat.st_size)
+    stamp = [_reference_digest(ref_file, ref_stat).hex(), out_digest.hex()]
+    return key, stamp
+
+
+def compare_files(ref_file, output_file, ignore_lines=None, max_differences=32, cache=None):
     """
     Compare two files line by line and return differences.
     
+    Both files are streamed, so memory use does not grow with file size, and
+    the comparison stops once max_differences differences have been found.
+    
     Args:
         ref_file: Path to reference file
         output_file: Path to output file to compare
         ignore_lines: List of line prefixes to ignore (e.g. ["REMARK   1 "])
+        max_differences: Maximum number of differences to collect. When more
+                         exist, the last difference has 'truncated' set to True.
+        cache: Optional pytest cache (request.config.cache). Passing results
+               are remembered keyed on both files' content digests, so a
+               later session producing the same output skips the compare.
         
     Returns:
         True if files match, or a list of differences
     """
-    if not os.path.exists(output_file):
+    # Stat each file once; the results are reused by every check below
+    try:
+        out_stat = os.stat(output_file)
+    except FileNotFoundError:
         pytest.fail(f"Output file not found: {output_file}")
     
-    if not os.path.exists(ref_file):
+    try:
+        ref_stat = os.stat(ref_file)
+    except FileNotFoundError:
         pytest.fail(f"Reference file not found: {ref_file}")
     
-    # For binary files or exact matching
-    if ignore_lines is None and filecmp.cmp(ref_file, output_file, shallow=False):
-        return True
+    if cache is not None:
+        cache_key, stamp = _comparison_cache_key(ref_file, output_file, ignore_lines, ref_stat, out_stat)
+        if cache.get(cache_key, None) == stamp:
+            return True
     
-    # For text files with line-by-line comparison
-    differences = []
-    with open(ref_file, 'r') as ref, open(output_file, 'r') as out:
-        ref_lines = ref.readlines()
-        out_lines = out.readlines()
+    # Byte-identical files (checked by size, then digest) also match once
+    # lines are filtered, so this short-circuits every comparison mode
+    if _files_identical(ref_file, output_file, ref_stat, out_stat):
+        result = True
+    else:
+        result = _compare_cdr_label_lines(ref_file, output_file, ignore_lines, max_differences)
+    
+    if cache is not None and result is True:
+        cache.set(cache_key, stamp)
+    return result
 
-        # Let's only compare lines that begin with REMARK PDBinfo-LABEL:
-        ref_lines = [line for line in ref_lines if line.startswith('REMARK PDBinfo-LABEL:')]
-        out_lines = [line for line in out_lines if line.startswith('REMARK PDBinfo-LABEL:')]
-        
-        # Filter lines if needed
-        if ignore_lines:
-            ref_lines = [line for line in ref_lines if not any(line.startswith(prefix) for prefix in ignore_lines)]
-            out_lines = [line for line in out_lines if not any(line.startswith(prefix) for prefix in ignore_lines)]
-        
-        # Check if file lengths match
-        if len(ref_lines) != len(out_lines):
-            differences.append({
-                'line': 0,
-                'message': f"File lengths differ: Reference has {len(ref_lines)} lines, output has {len(out_lines)} lines"
-            })
+
+def _compare_cdr_label_lines(ref_file, output_file, ignore_lines, max_differences):
+    """
+    Compare the CDR label lines of two files line by line.
+    
+    Args:
+        ref_file: Path to reference file
+        output_file: Path to output file to compare
+        ignore_lines: List of line prefixes to ignore
+        max_differences: Maximum number of differences to collect
         
-        # Get differences line by line
-        for i, (ref_line, out_line) in enumerate(zip(ref_lines, out_lines)):
-            ref_line = ref_line.strip()
-            out_line = out_line.strip()
-            if ref_line != out_line:
+    Returns:
+        True if the lines match, or a list of differences whose last entry
+        has 'truncated' set to True if the comparison stopped early
+    """
+    # For text files with line-by-line comparison. Lines stay as bytes and
+    # are only decoded when they end up in the report, replacing any bytes
+    # that are not valid UTF-8 rather than raising.
+    ignore_prefixes = tuple(prefix.encode() for prefix in ignore_lines or ())
+    differences = []
+    with open(ref_file, 'rb') as ref, open(output_file, 'rb') as out:
+        # Let's only compare lines that begin with REMARK PDBinfo-LABEL:
+        line_pairs = itertools.zip_longest(
+            _iter_cdr_label_lines(ref, ignore_prefixes),
+            _iter_cdr_label_lines(out, ignore_prefixes),
+        )
+        for i, (ref_line, out_line) in enumerate(line_pairs):
+            if ref_line == out_line:
+                continue
+            
+            if differences and len(differences) >= max_differences:
+                # Flag the cut-off on the last difference instead of adding
+                # an entry, so len(differences) counts real differences only
+                differences[-1]['truncated'] = True
+                break
+            
+            if ref_line is None:
+                out_text = out_line.decode(errors='replace')
+                differences.append({
+                    'line': i + 1,
+                    'out': out_text,
+                    'message': f"Output has extra line {i + 1}: {out_text}"
+                })
+            elif out_line is None:
+                ref_text = ref_line.decode(errors='replace')
+                differences.append({
+                    'line': i + 1,
+                    'ref': ref_text,
+                    'message': f"Output is missing line {i + 1}: {ref_text}"
+                })
+            else:
                 differences.append({
                     'line': i + 1,
-                    'ref': ref_line,
-                    'out': out_line
+                    'ref': ref_line.decode(errors='replace'),
+                    'out': out_line.decode(errors='replace')
                 })
     
     return differences if differences else True
 
 
-def copy_reference_files(ref_dir, output_dir):
+def _copy_reference_file(src_path, dst_path):
+    """
+    Copy one output file into the reference directory and record its digest.
+    
+    Args:
+        src_path: Path to output file
+        dst_path: Path to reference file to create
+        
+    Returns:
+        Tuple of (src_path, dst_path)
+    """
+    # Reference files only need their contents, not permissions or timestamps
+    _copy_file_contents(src_path, dst_path)
+    write_digest_sidecar(dst_path)
+    return src_path, dst_path
+
+
+def _copy_file_contents(src_path, dst_path):
+    """
+    Copy a file's contents with os.copy_file_range, falling back to shutil.copyfile.
+    
+    copy_file_range keeps the copy inside the kernel and lets filesystems
+    such as btrfs and XFS share extents instead of duplicating data. The
+    references are deliberately not hard links, since scripts rewrite their
+    outputs in place and would change the reference with them.
+    
+    Args:
+        src_path: Path to file to copy
+        dst_path: Path to copy to
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        # No progress with bytes left means the filesystem
+                        # does not support it; stopping here would leave a
+                        # truncated reference
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            # e.g. unsupported by the kernel or filesystem; copy normally
+            pass
+    shutil.copyfile(src_path, dst_path)
+
+
+def copy_reference_files(ref_dir, output_dir, max_workers=8):
     """
     Copy all reference files to the output directory.
     
     This can be used to create initial reference files when setting up the tests.
+    Files are copied concurrently; the data transfer happens in the kernel,
+    so the copies overlap on disk.
     
     Args:
         ref_dir: Path to reference directory
         output_dir: Path to output directory
+        max_workers: Maximum number of files copied at the same time
     """
+    src_paths, dst_paths = [], []
     for item in os.listdir(output_dir):
         src_path = os.path.join(output_dir, item)
         dst_path = os.path.join(ref_dir, item)
         
         if os.path.isfile(src_path) and item.endswith('.pdb'):
-            shutil.copy2(src_path, dst_path)
+            src_paths.append(src_path)
+            dst_paths.append(dst_path)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Results come back in submission order and re-raise any copy error
+        for src_path, dst_path in executor.map(_copy_reference_file, src_paths, dst_paths):
             print(f"Copied {src_path} -> {dst_path}")
 
 
@@ -395,8 +819,41 @@ def verify_hlt_format(pdb_file):
     """
     Verify that a PDB file conforms to HLT format requirements.
     
+    Results are cached on the file's path, modification time and size, so
+    re-checking an unchanged file within a session does not re-read it.
+    
+    Args:
+        pdb_file: Path to PDB file to verify
+        
+    Returns:
+        Dictionary with validation results
+    """
+    # Check if file exists
+    try:
+        pdb_stat = os.stat(pdb_file)
+    except FileNotFoundError:
+        return {
+            'valid': False,
+            'issues': [f"File not found: {pdb_file}"]
+        }
+    
+    results = _verify_hlt_format(str(pdb_file), pdb_stat.st_mtime_ns, pdb_stat.st_size)
+    # Hand out a copy so callers cannot modify the cached result
+    return {
+        'valid': results['valid'],
+        'issues': list(results['issues'])
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _verify_hlt_format(pdb_file, mtime_ns, size):
+    """
+    Check a PDB file against the HLT format requirements.
+    
     Args:
         pdb_file: Path to PDB file to verify
+        mtime_ns: Modification time of the file in nanoseconds (cache key only)
+        size: Size of the file in bytes (cache key only)
         
     Returns:
         Dictionary with validation results
@@ -406,79 +863,112 @@ def verify_hlt_format(pdb_file):
         'issues': []
     }
     
-    # Check if file exists
-    if not os.path.exists(pdb_file):
-        results['valid'] = False
-        results['issues'].append(f"File not found: {pdb_file}")
-        return results
-    
-    # Read file
-    with open(pdb_file, 'r') as f:
-        lines = f.readlines()
+    with open(pdb_file, 'rb') as f:
+        data = f.read()
     
-    # Check for valid chain IDs (H, L, T)
-    chain_ids = set()
-    for line in lines:
-        if line.startswith('ATOM') or line.startswith('HETATM'):
-            chain_id = line[21]
-            chain_ids.add(chain_id)
+    # Distinct chain IDs of the ATOM/HETATM records
+    chain_ids = {bytes([chain_id]) for chain_id in np.unique(_atom_chain_column(data))}
     
     # Check for required chains
-    required_chains = {'H'}  # At minimum, H chain should be present
-    missing_chains = required_chains - chain_ids
-    if missing_chains:
+    if _REQUIRED_HLT_CHAIN not in chain_ids:  # At minimum, H chain should be present
         results['valid'] = False
-        results['issues'].append(f"Missing required chains: {', '.join(missing_chains)}")
+        results['issues'].append(f"Missing required chains: {_REQUIRED_HLT_CHAIN.decode()}")
     
     # Check for invalid chains
-    valid_chains = {'H', 'L', 'T', ' '}
-    invalid_chains = chain_ids - valid_chains
+    invalid_chains = sorted(chain_ids - _VALID_HLT_CHAINS)
     if invalid_chains:
         results['valid'] = False
-        results['issues'].append(f"Invalid chain IDs found: {', '.join(invalid_chains)}")
+        invalid_list = ', '.join(chain_id.decode(errors='replace') for chain_id in invalid_chains)
+        results['issues'].append(f"Invalid chain IDs found: {invalid_list}")
     
     # Check for CDR annotations
-    cdr_annotations = []
-    for line in lines:
-        if line.startswith('REMARK PDBinfo-LABEL:'):
-            cdr_annotations.append(line.strip())
-    
-    if not cdr_annotations:
+    if not (data.startswith(_CDR_LABEL_PREFIX) or b'\n' + _CDR_LABEL_PREFIX in data):
         results['valid'] = False
         results['issues'].append("No CDR annotations found")
     
     return results
 
 
-def create_test_report(test_results, output_file="test_report.txt"):
+def _atom_chain_column(data):
+    """
+    Extract the chain ID byte of every ATOM/HETATM record in PDB file contents.
+    
+    PDB records are fixed-width, so the chain ID is always at column 22
+    (offset 21). The line starts are found with numpy and the record names
+    and chain column are read for all lines at once, with no Python-level
+    loop over lines.
+    
+    Args:
+        data: Contents of a PDB file as bytes
+        
+    Returns:
+        uint8 numpy array with the chain ID byte of each ATOM/HETATM line
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(arr == ord('\n'))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.append(newlines, len(arr))
+    
+    # Only lines long enough to reach the chain ID column
+    starts = starts[ends - starts > 21]
+    is_atom = _lines_start_with(arr, starts, _ATOM_PREFIX) | _lines_start_with(arr, starts, _HETATM_PREFIX)
+    return arr[starts[is_atom] + 21]
+
+
+def _lines_start_with(arr, starts, prefix):
+    """
+    Check which lines begin with a prefix.
+    
+    Args:
+        arr: uint8 numpy array of the file contents
+        starts: Offsets of the lines to check, each line longer than prefix
+        prefix: Bytes prefix to look for
+        
+    Returns:
+        Boolean numpy array, True where the line at that offset starts with prefix
+    """
+    mask = np.ones(len(starts), dtype=bool)
+    for offset, byte in enumerate(prefix):
+        mask &= arr[starts + offset] == byte
+    return mask
+
+
+def create_test_report(test_results, output_file="test_report.txt", extra=None):
     """
     Create a test report summarizing results.
     
     Args:
         test_results: Dictionary mapping script names to test results
         output_file: Path to write report to
+        extra: Optional text appended to the end of the report (e.g. test
+               environment details), written in the same file session
     """
-    with open(output_file, 'w') as f:
-        f.write("Utility Scripts Test Report\n")
-        f.write("==========================\n\n")
-        
-        total_tests = len(test_results)
-        passed_tests = sum(1 for result in test_results.values() if result['passed'])
-        
-        f.write(f"Total tests: {total_tests}\n")
-        f.write(f"Passed: {passed_tests}\n")
-        f.write(f"Failed: {total_tests - passed_tests}\n\n")
+    total_tests = len(test_results)
+    passed_tests = sum(1 for result in test_results.values() if result['passed'])
+    
+    # Build the whole report in memory so it is written in a single call
+    parts = [
+        "Utility Scripts Test Report\n",
+        "==========================\n\n",
+        f"Total tests: {total_tests}\n",
+        f"Passed: {passed_tests}\n",
+        f"Failed: {total_tests - passed_tests}\n\n",
+        "Test Details:\n",
+        "------------\n\n",
+    ]
+    
+    for script, result in test_results.items():
+        status = " PASSED" if result['passed'] else " FAILED"
+        parts.append(f"{script}: {status}\n")
         
-        f.write("Test Details:\n")
-        f.write("------------\n\n")
+        if not result['passed'] and 'details' in result:
+            parts.append("  Failures:\n")
+            parts.extend(f"  - {detail}\n" for detail in result['details'])
         
-        for script, result in test_results.items():
-            status = " PASSED" if result['passed'] else " FAILED"
-            f.write(f"{script}: {status}\n")
-            
-            if not result['passed'] and 'details' in result:
-                f.write(f"  Failures:\n")
-                for detail in result['details']:
-                    f.write(f"  - {detail}\n")
-            
-            f.write("\n")
\ No newline at end of file
+        parts.append("\n")
+    
+    if extra:
+        parts.append(extra)
+    
+    with open(output_file, 'w', buffering=1 << 16) as f:
+        f.write(''.join(parts))
\ No newline at end of file